@@ -1,6 +1,7 @@
 """
 This module contains several constants.
 """
+from typing import Tuple
 
 LEGACY_API_URL: str = "https://api.deezer.com/"
 """The url of Deezer's official API server."""
@@ -14,8 +15,20 @@ METHOD_GET_USER: str = "deezer.getUserData"
 METHOD_GET_TRACK: str = "song.getData"
 """The `song.getData` method for the Deezer API request."""
 
+METHOD_GET_TRACK_LIST: str = "song.getListData"
+"""The `song.getListData` method for the Deezer API request."""
+
 METHOD_GET_LYRICS: str = "song.getLyrics"
 """The `song.getLyrics` method for the Deezer API request."""
 
 METHOD_PAGE_TRACK: str = "deezer.pageTrack"
 """The `deezer.pageTrack` method for the Deezer API request."""
+
+BITRATES: Tuple[str, ...] = ("FLAC", "MP3_320", "MP3_256", "MP3_128")
+"""The available bitrates from the best to the worst, used as a fallback order."""
+
+DOWNLOAD_CHUNK_SIZE: int = 1 << 20
+"""
+The maximum size in bytes of a chunk read from a track response. A chunk
+can be smaller, it contains only the data already received at the moment.
+"""
@@ -1,26 +1,39 @@
 """This module contains the Session class."""
+from __future__ import annotations
+
 import asyncio
+import inspect
 import time
 import re
 import typing as ty
 from pathlib import Path
 from typing import Union, Generator, Any, Tuple, Optional, Callable
 
+import aiofiles
 import aiohttp
+import orjson
 
 from . import errors, consts, utils, types
 
+_DEEZER_URL_RE = re.compile(r"https?://(?:www\.)?deezer\.com/(?:\w+/)?(\w+)/(\d+)")
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/")
+
+Destination = Union[Path, Callable[[str], Path]]
+"""A file path or a callable that builds it from the bitrate finally used."""
+
 
 class Session:
     """A session is required to connect to Deezer's unofficial API."""
 
-    def __init__(self, arl_token: str):
+    def __init__(self, arl_token: str, max_parallel_tracks: int = 4):
         """
         Creates a new Deezer session instance.
 
         Args:
             arl_token (str): The arl token is used to make API requests
                 on Deezer's unofficial API
+            max_parallel_tracks: How many tracks can be downloaded
+                at the same time, the rest of them wait for their turn.
 
         Raises:
             DeezerLoginError: The specified arl token is not valid.
@@ -30,13 +43,28 @@ class Session:
         self._cookies = {"arl": self._arl_token}
         self._csrf_token = ""
         self._session_expires = 0
+        self._max_parallel_tracks = max_parallel_tracks
+        self._download_semaphore: ty.Optional[asyncio.Semaphore] = None
+
+    @property
+    def http_session(self) -> Optional[aiohttp.ClientSession]:
+        """
+        The pooled aiohttp session of this Deezer session. Pass it to
+        [Album][async_deethon.types.Album] and [Track][async_deethon.types.Track]
+        methods to reuse its connections. It's created on entering the session
+        context or on the first request.
+        """
+        return self._session
 
     async def update_requests_session(self):
+        if self._download_semaphore is None:
+            self._download_semaphore = asyncio.Semaphore(self._max_parallel_tracks)
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession(
-                connector=aiohttp.TCPConnector(ssl=False),
+                connector=utils.create_connector(),
                 skip_auto_headers={"User-Agent"},
                 raise_for_status=True,
+                json_serialize=utils.json_dumps,
                 cookies=self._cookies
             )
 
@@ -51,14 +79,14 @@ class Session:
         async with self._session.get(
             consts.LEGACY_API_URL + "search/album", params={"q": name}
         ) as response:
-            albums = await response.json()
+            albums = await response.json(loads=orjson.loads)
             return albums["data"]
 
     async def _find_tracks(self, name: str):
         async with self._session.get(
             consts.LEGACY_API_URL + "search", params={"q": name}
         ) as response:
-            tracks = await response.json()
+            tracks = await response.json(loads=orjson.loads)
             return tracks["data"]
 
     async def search_songs(
@@ -109,14 +137,27 @@ class Session:
         async with self._session.post(
             consts.API_URL, params=params, json=json
         ) as response:
-            response = await response.json()
+            response = await response.json(loads=orjson.loads)
             return response["results"]
 
+    async def get_songs_bulk(self, ids: ty.List[int]) -> dict:
+        """
+        Fetches the unofficial API song data of several tracks in one request.
+
+        Args:
+            ids: The Deezer track IDs.
+
+        Returns:
+            The `song.getListData` results, the songs are placed under `data`.
+        """
+        return await self.get_api(consts.METHOD_GET_TRACK_LIST, {"sng_ids": ids})
+
     async def download(
         self,
         url: str,
         bitrate: str = "FLAC",
         progress_callback: Optional[Callable] = None,
+        dest: Optional[Path] = None,
     ):
         """
         Downloads the given Deezer url if possible.
@@ -127,25 +168,31 @@ class Session:
                 (`FLAC`, `MP3_320`, `MP3_256`, `MP3_128`).
             progress_callback (callable): A callable that accepts
                 `current` and `bytes` arguments.
+            dest: The file (for a track) or the root directory
+                (for an album) the download is streamed to.
 
         Raises:
             ActionNotSupported: The specified URL is not (yet)
                 supported for download.
             InvalidUrlError: The specified URL is not a valid deezer link.
         """
-        match = re.match(r"https?://(?:www\.)?deezer\.com/(?:\w+/)?(\w+)/(\d+)", url)
+        match = _DEEZER_URL_RE.match(url)
         if match:
+            await self.update_requests_session()
             mode = match.group(1)
             content_id = int(match.group(2))
             if mode == "track":
                 return await self.download_track(
-                    await types.Track.init_via_track_id(content_id),
+                    await types.Track.init_via_track_id(content_id, self._session),
                     bitrate,
                     progress_callback,
+                    dest=dest,
                 )
             if mode == "album":
                 return await self.download_album(
-                    await types.Album.init_via_album_id(content_id), bitrate
+                    await types.Album.init_via_album_id(content_id, self._session),
+                    bitrate,
+                    dest=dest,
                 )
             raise errors.ActionNotSupported(mode)
         raise errors.InvalidUrlError(url)
@@ -155,8 +202,10 @@ class Session:
         track: types.Track,
         bitrate: str = "FLAC",
         progress_callback: Optional[Callable[[int, int], None]] = None,
-        callback_calls_delay: float = 0.1
-    ) -> bytes:
+        callback_calls_delay: float = 0.1,
+        dest: Optional[Destination] = None,
+        parts: int = 1,
+    ) -> Union[bytes, bytearray, Path]:
         """
         Downloads the given [Track][async_deethon.types.Track] object.
 
@@ -164,64 +213,200 @@ class Session:
             track: A [Track][async_deethon.types.Track] instance.
             bitrate: The preferred bitrate to download
                 (`FLAC`, `MP3_320`, `MP3_256`, `MP3_128`).
-            progress_callback: A callable that accepts
-                `current` and `bytes` arguments.
+            progress_callback: A callable or a coroutine function
+                that accepts `current` and `bytes` arguments.
+                It is called inline, so it should be cheap.
 
             callback_calls_delay: Delay between calback calls
+            dest: If passed, the track is streamed chunk by chunk
+                into this file instead of being kept in memory.
+                Keeping big tracks (>50 MB) in memory is discouraged.
+                It can also be a callable that receives the bitrate
+                left after the fallback and returns the file path.
+            parts: The number of parallel HTTP `Range` requests the track
+                is split into. Used only if the server accepts ranges.
 
         Returns:
-            The file path of the downloaded track.
+            The content of the track or the file path
+            if `dest` is passed. The content is a `bytearray`
+            if the track is downloaded in several parts.
 
         Raises:
             DownloadError: The track is not downloadable.
         """
         await self.update_requests_session()
-        quality = utils.get_quality(bitrate)
-        await track.add_more_tags(self)
-        download_url = utils.get_stream_url(track, quality)
+        if track.md5_origin is None:
+            await track.add_more_tags(self)
+        async with self._download_semaphore:
+            return await self._download_track(
+                track, bitrate, progress_callback, callback_calls_delay, dest, parts
+            )
 
-        async with self._session.get(download_url) as response:
-            total = int(response.headers["Content-Length"])
-            if not total:
-                if bitrate == "FLAC":
-                    fallback_bitrate = "MP3_320"
-                elif bitrate == "MP3_320":
-                    fallback_bitrate = "MP3_256"
-                elif bitrate == "MP3_256":
-                    fallback_bitrate = "MP3_128"
-                else:
-                    raise errors.DownloadError(track.id)
-                return await self.download_track(
-                    track, fallback_bitrate, progress_callback
+    async def _download_track(
+        self,
+        track: types.Track,
+        bitrate: str,
+        progress_callback: Optional[Callable[[int, int], None]],
+        callback_calls_delay: float,
+        dest: Optional[Destination],
+        parts: int,
+    ) -> Union[bytes, bytearray, Path]:
+        if bitrate in consts.BITRATES:
+            bitrates = consts.BITRATES[consts.BITRATES.index(bitrate) :]
+        else:
+            bitrates = (bitrate,)
+
+        for fallback_bitrate in bitrates:
+            quality = utils.get_quality(fallback_bitrate)
+            download_url = utils.get_stream_url(track, quality)
+            total, accepts_ranges = await self._probe_bitrate(download_url)
+            if total:
+                break
+        else:
+            raise errors.DownloadError(track.id)
+
+        if callable(dest):
+            dest = dest(fallback_bitrate)
+
+        progress = _Progress(total, progress_callback, callback_calls_delay)
+        if parts > 1 and accepts_ranges:
+            try:
+                return await self._download_ranges(
+                    download_url, total, parts, dest, progress
                 )
+            except _RangeNotSatisfiedError:
+                # The server advertises ranges but doesn't honour them
+                progress = _Progress(total, progress_callback, callback_calls_delay)
+
+        async with self._session.get(download_url) as response:
+            return await self._save_stream(response, dest, progress)
 
-            current = 0
-            buffer = b""
-            last_callback_call = time.monotonic()
-            async for data, _ in response.content.iter_chunks():
-                current += len(data)
-                buffer += data
-                if progress_callback:
-                    now = time.monotonic()
-                    if now - last_callback_call > callback_calls_delay:
-                        asyncio.create_task(progress_callback(current, total))
-                        last_callback_call = now
+    async def _probe_bitrate(self, download_url: str) -> Tuple[int, bool]:
+        async with self._session.head(download_url, allow_redirects=True) as response:
+            return (
+                int(response.headers.get("Content-Length", 0)),
+                response.headers.get("Accept-Ranges") == "bytes",
+            )
 
+    async def _save_stream(
+        self,
+        response: aiohttp.ClientResponse,
+        dest: Optional[Path],
+        progress: _Progress,
+    ) -> Union[bytes, Path]:
+        if dest is None:
+            chunks: ty.List[bytes] = []
+            await self._read_stream(response, chunks.append, progress)
+            return b"".join(chunks)
+
+        async with aiofiles.open(dest, "wb") as file:
+            await self._read_stream(response, file.write, progress)
+        return dest
+
+    async def _download_ranges(
+        self,
+        url: str,
+        total: int,
+        parts: int,
+        dest: Optional[Path],
+        progress: _Progress,
+    ) -> Union[bytearray, Path]:
+        ranges = _split_ranges(total, parts)
+        if dest is None:
+            buffer = bytearray(total)
+            await _gather_or_cancel(
+                *[
+                    self._fetch_range(
+                        url, start, end, _buffer_writer(buffer, start, end), progress
+                    )
+                    for start, end in ranges
+                ]
+            )
             return buffer
 
+        async with aiofiles.open(dest, "wb") as file:
+            await file.truncate(total)
+
+        async def write_range(start: int, end: int) -> None:
+            async with aiofiles.open(dest, "r+b") as range_file:
+                await range_file.seek(start)
+                await self._fetch_range(url, start, end, range_file.write, progress)
+
+        await _gather_or_cancel(*[write_range(start, end) for start, end in ranges])
+        return dest
+
+    async def _fetch_range(
+        self,
+        url: str,
+        start: int,
+        end: int,
+        consumer: Callable[[bytes], Any],
+        progress: _Progress,
+    ) -> None:
+        async with self._session.get(
+            url, headers={"Range": f"bytes={start}-{end}"}
+        ) as response:
+            content_range = _CONTENT_RANGE_RE.match(
+                response.headers.get("Content-Range", "")
+            )
+            if (
+                response.status != 206
+                or content_range is None
+                or (int(content_range.group(1)), int(content_range.group(2)))
+                != (start, end)
+            ):
+                raise _RangeNotSatisfiedError
+
+            size = end - start + 1
+            received = 0
+
+            def checked_consumer(data: bytes) -> Any:
+                nonlocal received
+                received += len(data)
+                if received > size:
+                    raise _RangeNotSatisfiedError
+                return consumer(data)
+
+            await self._read_stream(response, checked_consumer, progress)
+            if received != size:
+                raise _RangeNotSatisfiedError
+
+    @staticmethod
+    async def _read_stream(
+        response: aiohttp.ClientResponse,
+        consumer: Callable[[bytes], Any],
+        progress: _Progress,
+    ) -> None:
+        async for data in response.content.iter_chunked(
+            consts.DOWNLOAD_CHUNK_SIZE
+        ):
+            result = consumer(data)
+            if inspect.isawaitable(result):
+                await result
+            await progress.advance(len(data))
+
     async def download_track_via_id(
         self,
         track_id: int,
         bitrate: str = "FLAC",
         progress_callback: Optional[Callable] = None,
-        callback_calls_delay: float = 0.1
-    ) -> bytes:
-        track = await types.Track.init_via_track_id(track_id)
-        return await self.download_track(track, bitrate, progress_callback, callback_calls_delay)
+        callback_calls_delay: float = 0.1,
+        dest: Optional[Destination] = None,
+        parts: int = 1,
+    ) -> Union[bytes, bytearray, Path]:
+        await self.update_requests_session()
+        track = await types.Track.init_via_track_id(track_id, self._session)
+        return await self.download_track(
+            track, bitrate, progress_callback, callback_calls_delay, dest, parts
+        )
 
     async def download_album(
-        self, album: types.Album, bitrate: str = None, stream: bool = False
-    ) -> tuple:
+        self,
+        album: types.Album,
+        bitrate: str = None,
+        stream: bool = False,
+        dest: Optional[Path] = None,
+    ) -> Union[tuple, ty.AsyncIterator[Tuple[types.Track, Union[bytes, Path]]]]:
         """
         Downloads an album from Deezer using the specified Album object.
 
@@ -229,19 +414,131 @@ class Session:
             album: An [Album][async_deethon.types.Album] instance.
             bitrate: The preferred bitrate to download
                 (`FLAC`, `MP3_320`, `MP3_256`, `MP3_128`).
-            stream: If `true`, this method returns a generator object,
-                otherwise the downloaded files are returned as a tuple
-                that contains the file paths.
+            stream: If `true`, this method returns an async generator
+                that yields `(track, result)` pairs as soon as each track
+                is downloaded, otherwise it waits for all the tracks
+                and returns the results in the album order.
+            dest: If passed, every track is streamed into its own file
+                inside this directory, see
+                [get_file_path()][async_deethon.utils.get_file_path].
 
         Returns:
-            The file paths.
+            The contents of the tracks or the file paths if `dest` is passed.
         """
-        download_coros = [
-            self.download_track(track, bitrate) for track in album.fetch_tracks()
-        ]
-        tracks = await asyncio.gather(*download_coros)
-        return tracks
+        tracks = album.fetch_tracks()
+        bulk = await self.get_songs_bulk([track.id for track in tracks])
+        songs = {int(song["SNG_ID"]): song for song in bulk["data"]}
+        for track in tracks:
+            song = songs.get(track.id)
+            if song is not None:
+                track.set_more_tags(song)
+
+        def track_path(track: types.Track) -> Destination:
+            return lambda final_bitrate: utils.get_file_path(
+                track, utils.get_extension(final_bitrate), album=album, root=dest
+            )
+
+        def download(track: types.Track) -> ty.Awaitable[Union[bytes, Path]]:
+            return self.download_track(
+                track, bitrate, dest=None if dest is None else track_path(track)
+            )
+
+        if stream:
+            return self._iter_completed(tracks, download)
+        return await asyncio.gather(*[download(track) for track in tracks])
+
+    @staticmethod
+    async def _iter_completed(
+        tracks: ty.List[types.Track],
+        download: Callable[[types.Track], ty.Awaitable[Union[bytes, Path]]],
+    ) -> ty.AsyncIterator[Tuple[types.Track, Union[bytes, Path]]]:
+        async def with_track(track):
+            return track, await download(track)
+
+        tasks = [asyncio.ensure_future(with_track(track)) for track in tracks]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def close(self):
+        """
+        Closes the underlying aiohttp session. The session shared by
+        requests made without a Deezer session is closed separately with
+        [close_shared_session()][async_deethon.utils.close_shared_session].
+        """
         if self._session is not None and not self._session.closed:
-            await self._session.close()
\ No newline at end of file
+            await self._session.close()
+
+    async def __aenter__(self) -> Session:
+        await self.update_requests_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class _Progress:
+    """Reports the download progress to a callback not more often than needed."""
+
+    def __init__(
+        self,
+        total: int,
+        callback: Optional[Callable[[int, int], None]],
+        calls_delay: float,
+    ):
+        self.total = total
+        self.current = 0
+        self._callback = callback
+        self._calls_delay = calls_delay
+        self._last_call = time.monotonic()
+
+    async def advance(self, size: int) -> None:
+        self.current += size
+        if self._callback is None:
+            return
+        now = time.monotonic()
+        if now - self._last_call > self._calls_delay or self.current == self.total:
+            self._last_call = now
+            result = self._callback(self.current, self.total)
+            if inspect.isawaitable(result):
+                await result
+
+
+class _RangeNotSatisfiedError(Exception):
+    """Occurs when a ranged response doesn't match the requested range."""
+
+
+def _split_ranges(total: int, parts: int) -> ty.List[Tuple[int, int]]:
+    step = -(-total // parts)
+    return [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+
+
+async def _gather_or_cancel(*coros: ty.Awaitable[Any]) -> None:
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _buffer_writer(
+    buffer: bytearray, start: int, end: int
+) -> Callable[[bytes], None]:
+    view = memoryview(buffer)
+    position = start
+
+    def write(data: bytes) -> None:
+        nonlocal position
+        if position + len(data) > end + 1:
+            raise _RangeNotSatisfiedError
+        view[position : position + len(data)] = data
+        position += len(data)
+
+    return write
@@ -2,46 +2,39 @@
 from __future__ import annotations
 
 import typing as ty
+import weakref
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional, List, Dict, Any, ClassVar
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, ClassVar, FrozenSet
 
 import aiohttp
+import orjson
 
-from . import consts, errors
+from . import consts, errors, utils
 
 
 async def _bytes_get_request(
     session: ty.Optional[aiohttp.ClientSession] = None, *args, **kwargs
 ) -> bytes:
-    close_session = session is None
-    if close_session:
-        session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False),
-            skip_auto_headers={"User-Agent"},
-            raise_for_status=True,
-        )
+    if session is None:
+        session = await utils.shared_session()
     async with session.get(*args, **kwargs) as response:
-        response = await response.read()
-        if close_session:
-            await session.close()
-        return response
+        return await response.read()
 
 
 async def _json_get_request(
     session: ty.Optional[aiohttp.ClientSession] = None, *args, **kwargs
 ) -> dict:
-    close_session = session is None
-    if close_session:
-        session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False),
-            skip_auto_headers={"User-Agent"},
-            raise_for_status=True,
-        )
+    if session is None:
+        session = await utils.shared_session()
     async with session.get(*args, **kwargs) as response:
-        response = await response.json()
-        if close_session:
-            await session.close()
-        return response
+        return await response.json(loads=orjson.loads)
+
+
+def _parse_date(date: str) -> datetime:
+    try:
+        return datetime(int(date[0:4]), int(date[5:7]), int(date[8:10]))
+    except ValueError:
+        return datetime.strptime(date, "%Y-%m-%d")
 
 
 class Album:
@@ -68,7 +61,35 @@ class Album:
 
     """
 
-    _cache: ClassVar[Dict[int, Album]] = {}
+    __slots__ = (
+        "artist",
+        "basic_tracks_data",
+        "cover_small_link",
+        "cover_medium_link",
+        "cover_big_link",
+        "cover_xl_link",
+        "duration",
+        "genres",
+        "id",
+        "label",
+        "link",
+        "record_type",
+        "release_date",
+        "title",
+        "total_tracks",
+        "upc",
+        "_cover_small",
+        "_cover_medium",
+        "_cover_big",
+        "_cover_xl",
+        "_tracks",
+        "_initialized",
+        "__weakref__",
+    )
+
+    _cache: ClassVar[weakref.WeakValueDictionary[int, Album]] = (
+        weakref.WeakValueDictionary()
+    )
 
     artist: str
     basic_tracks_data: List[Dict[str, Any]]
@@ -87,10 +108,11 @@ class Album:
     total_tracks: int
     upc: str
 
-    _cover_small: Optional[bytes] = None
-    _cover_medium: Optional[bytes] = None
-    _cover_big: Optional[bytes] = None
-    _cover_xl: Optional[bytes] = None
+    _cover_small: Optional[bytes]
+    _cover_medium: Optional[bytes]
+    _cover_big: Optional[bytes]
+    _cover_xl: Optional[bytes]
+    _tracks: Optional[List[Track]]
 
     def __new__(cls, album_info: dict):
         """
@@ -103,9 +125,10 @@ class Album:
 
         """
         album_id = album_info["id"]
-        if album_id not in cls._cache.keys():
-            cls._cache[album_id] = super(Album, cls).__new__(cls)
-        return cls._cache[album_id]
+        if (album := cls._cache.get(album_id)) is None:
+            album = super(Album, cls).__new__(cls)
+            cls._cache[album_id] = album
+        return album
 
     def __init__(self, album_info: dict):
         """
@@ -118,6 +141,8 @@ class Album:
             DeezerApiError: The Deezer API request replied with an error.
 
         """
+        if getattr(self, "_initialized", False):
+            return
         if "error" in album_info:
             raise errors.DeezerApiError(
                 album_info["error"]["type"],
@@ -137,11 +162,18 @@ class Album:
         self.label = album_info["label"]
         self.link = album_info["link"]
         self.record_type = album_info["record_type"]
-        self.release_date = datetime.strptime(album_info["release_date"], "%Y-%m-%d")
+        self.release_date = _parse_date(album_info["release_date"])
         self.title = album_info["title"]
         self.total_tracks = album_info["nb_tracks"]
         self.upc = album_info["upc"]
 
+        self._cover_small = None
+        self._cover_medium = None
+        self._cover_big = None
+        self._cover_xl = None
+        self._tracks = None
+        self._initialized = True
+
     @classmethod
     async def init_via_album_id(
         cls, album_id: int, session: ty.Optional[aiohttp.ClientSession] = None
@@ -151,28 +183,44 @@ class Album:
         )
         return cls(info)
 
-    async def fetch_cover_small(self) -> bytes:
+    async def fetch_cover_small(
+        self, session: ty.Optional[aiohttp.ClientSession] = None
+    ) -> bytes:
         """The album cover in small size."""
         if not self._cover_small:
-            self._cover_small = await _bytes_get_request(None, self.cover_small_link)
+            self._cover_small = await _bytes_get_request(
+                session, self.cover_small_link
+            )
         return self._cover_small
 
-    async def fetch_cover_medium(self) -> bytes:
+    async def fetch_cover_medium(
+        self, session: ty.Optional[aiohttp.ClientSession] = None
+    ) -> bytes:
         """The album cover in medium size."""
         if not self._cover_medium:
-            self._cover_medium = await _bytes_get_request(None, self.cover_medium_link)
+            self._cover_medium = await _bytes_get_request(
+                session, self.cover_medium_link
+            )
         return self._cover_medium
 
-    async def fetch_cover_big(self) -> bytes:
+    async def fetch_cover_big(
+        self, session: ty.Optional[aiohttp.ClientSession] = None
+    ) -> bytes:
         """The album cover in big size."""
         if not self._cover_big:
-            self._cover_big = await _bytes_get_request(None, self.cover_big_link)
+            self._cover_big = await _bytes_get_request(
+                session, self.cover_big_link
+            )
         return self._cover_big
 
-    async def fetch_cover_xl(self) -> bytes:
+    async def fetch_cover_xl(
+        self, session: ty.Optional[aiohttp.ClientSession] = None
+    ) -> bytes:
         """The album cover in xl size."""
         if not self._cover_xl:
-            self._cover_xl = await _bytes_get_request(None, self.cover_xl_link)
+            self._cover_xl = await _bytes_get_request(
+                session, self.cover_xl_link
+            )
         return self._cover_xl
 
     def fetch_tracks(self) -> list:
@@ -180,8 +228,11 @@ class Album:
         A list of [Track][async_deethon.types.Track] objects for each
         track in the album.
         """
-        tracks = [Track(track_scheme) for track_scheme in self.basic_tracks_data]
-        return tracks
+        if self._tracks is None:
+            self._tracks = [
+                Track(track_scheme) for track_scheme in self.basic_tracks_data
+            ]
+        return list(self._tracks)
 
 
 class Track:
@@ -218,11 +269,57 @@ class Track:
     !!! Info
         `md5_origin`, `media_version`, `composer`, `author` and all
         `lyrics*` tags are only set after
-        [add_more_tags()][async_deethon.types.Track.add_more_tags] is called.
-        Defaults to `None`.
+        [add_more_tags()][async_deethon.types.Track.add_more_tags] or
+        [set_more_tags()][async_deethon.types.Track.set_more_tags] is called.
+        Defaults to `None`. `song.getListData` data contains no lyrics.
     """
 
-    _cache: ClassVar[Dict[int, Track]] = {}
+    __slots__ = (
+        "album_id",
+        "artist",
+        "artists",
+        "bpm",
+        "disk_number",
+        "duration",
+        "id",
+        "isrc",
+        "link",
+        "number",
+        "preview_link",
+        "rank",
+        "replaygain_track_gain",
+        "release_date",
+        "title",
+        "title_short",
+        "md5_origin",
+        "media_version",
+        "composer",
+        "author",
+        "copyright",
+        "lyrics",
+        "lyrics_sync",
+        "lyrics_copyrights",
+        "lyrics_writers",
+        "_initialized",
+        "__weakref__",
+    )
+
+    _cache: ClassVar[weakref.WeakValueDictionary[int, Track]] = (
+        weakref.WeakValueDictionary()
+    )
+    _extra_tag_names: ClassVar[FrozenSet[str]] = frozenset(
+        (
+            "md5_origin",
+            "media_version",
+            "composer",
+            "author",
+            "copyright",
+            "lyrics",
+            "lyrics_sync",
+            "lyrics_copyrights",
+            "lyrics_writers",
+        )
+    )
 
     album_id: int
     artist: str
@@ -262,9 +359,10 @@ class Track:
 
         """
         track_id = track_info["id"]
-        if track_id not in cls._cache.keys():
-            cls._cache[track_id] = super(Track, cls).__new__(cls)
-        return cls._cache[track_id]
+        if (track := cls._cache.get(track_id)) is None:
+            track = super(Track, cls).__new__(cls)
+            cls._cache[track_id] = track
+        return track
 
     def __init__(self, track_info: dict):
         """
@@ -277,6 +375,8 @@ class Track:
             DeezerApiError: The Deezer API request replied with an error.
 
         """
+        if getattr(self, "_initialized", False):
+            return
         if "error" in track_info:
             raise errors.DeezerApiError(
                 track_info["error"]["type"],
@@ -297,9 +397,10 @@ class Track:
         self.preview_link = track_info["preview"]
         self.rank = track_info["rank"]
         self.replaygain_track_gain = f"{((track_info['gain'] + 18.4) * -1):.2f} dB"
-        self.release_date = datetime.strptime(track_info["release_date"], "%Y-%m-%d")
+        self.release_date = _parse_date(track_info["release_date"])
         self.title = track_info["title"]
         self.title_short = track_info["title_short"]
+        self._initialized = True
 
     @classmethod
     async def init_via_track_id(
@@ -310,9 +411,11 @@ class Track:
         )
         return cls(info)
 
-    async def fetch_album(self) -> Album:
+    async def fetch_album(
+        self, session: ty.Optional[aiohttp.ClientSession] = None
+    ) -> Album:
         """Return an Album instance."""
-        return await Album.init_via_album_id(self.album_id)
+        return await Album.init_via_album_id(self.album_id, session)
 
     async def add_more_tags(self, session) -> None:
         """
@@ -324,28 +427,44 @@ class Track:
 
         """
         r = await session.get_api(consts.METHOD_PAGE_TRACK, {"sng_id": self.id})
-        try:
-            self.md5_origin = r["DATA"]["MD5_ORIGIN"]
-        except:
-            breakpoint()
-        self.media_version = r["DATA"]["MEDIA_VERSION"]
-
-        if isinstance(r["DATA"]["SNG_CONTRIBUTORS"], list):
-            self.composer = None
-            self.author = None
-        else:
-            self.composer = r["DATA"]["SNG_CONTRIBUTORS"].get("composer")
-            self.author = r["DATA"]["SNG_CONTRIBUTORS"].get("author")
+        self.set_more_tags(r["DATA"], r.get("LYRICS"))
 
-        self.copyright = r["DATA"]["COPYRIGHT"]
+    def set_more_tags(self, data: dict, lyrics: Optional[dict] = None) -> None:
+        """
+        Sets the tags from an already fetched Deezer's unofficial API song data.
 
-        if "LYRICS" in r.keys():
-            self.lyrics = r["LYRICS"].get("LYRICS_TEXT")
-            self.lyrics_sync = r["LYRICS"].get("LYRICS_SYNC_JSON")
-            self.lyrics_copyrights = r["LYRICS"].get("LYRICS_COPYRIGHTS")
-            self.lyrics_writers = r["LYRICS"].get("LYRICS_WRITERS").split(", ")
+        Args:
+            data: The song data (`DATA` of `deezer.pageTrack` or an item of
+                `song.getListData`).
+            lyrics: The lyrics data, if available.
+
+        """
+        contributors = data["SNG_CONTRIBUTORS"]
+        # Deezer sends an empty list instead of an empty object
+        if isinstance(contributors, list):
+            contributors = {}
+
+        self.md5_origin = data["MD5_ORIGIN"]
+        self.media_version = data["MEDIA_VERSION"]
+        self.composer = contributors.get("composer")
+        self.author = contributors.get("author")
+        self.copyright = data.get("COPYRIGHT")
+
+        if lyrics is not None:
+            self.lyrics = lyrics.get("LYRICS_TEXT")
+            self.lyrics_sync = lyrics.get("LYRICS_SYNC_JSON")
+            self.lyrics_copyrights = lyrics.get("LYRICS_COPYRIGHTS")
+            self.lyrics_writers = lyrics.get("LYRICS_WRITERS").split(", ")
         else:
             self.lyrics = None
             self.lyrics_sync = None
             self.lyrics_copyrights = None
             self.lyrics_writers = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Returns `None` for extra tags that have not been set yet."""
+        if name in self._extra_tag_names:
+            return None
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
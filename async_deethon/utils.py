@@ -4,17 +4,107 @@ The utils module contains several useful functions that are used within the pack
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
+import ssl
 from binascii import b2a_hex
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Union
 
+import aiohttp
+import certifi
+import orjson
 from Crypto.Cipher import AES
 from mutagen.flac import FLAC, Picture
 from mutagen.id3 import ID3, Frames
 
 if TYPE_CHECKING:
-    from .types import Track
+    from .types import Album, Track
+
+
+_AES_CIPHER = AES.new(b"jo6aey6haid2Teih", AES.MODE_ECB)
+_PAD = b"\x00" * 16
+_FORBIDDEN = str.maketrans("", "", r'\/*?:"<>|')
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def json_dumps(obj) -> str:
+    """
+    Serialize an object to JSON using `orjson`, it's passed
+    as `json_serialize` to the aiohttp sessions.
+    """
+    return orjson.dumps(obj).decode()
+
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle is slow, so it's done on the first connection
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def create_connector() -> aiohttp.TCPConnector:
+    """
+    Create a connector with the connection pool settings used by the package.
+
+    Returns:
+        A new `aiohttp.TCPConnector` instance.
+    """
+    return aiohttp.TCPConnector(
+        ssl=_ssl_context(),
+        limit=100,
+        limit_per_host=16,
+        keepalive_timeout=60,
+        ttl_dns_cache=300,
+    )
+
+
+async def shared_session() -> aiohttp.ClientSession:
+    """
+    Get the aiohttp session shared by the requests made without
+    a [Session][async_deethon.session.Session], e.g. fetching album covers.
+    The session is created lazily for the running event loop, the session
+    of a previous event loop is closed. Call
+    [close_shared_session()][async_deethon.utils.close_shared_session]
+    before your event loop is finished.
+
+    Returns:
+        The shared `aiohttp.ClientSession` instance.
+    """
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session_loop is not loop:
+        await close_shared_session()
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=create_connector(),
+            skip_auto_headers={"User-Agent"},
+            raise_for_status=True,
+            json_serialize=json_dumps,
+        )
+        _shared_session_loop = loop
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    """
+    Close the session returned by
+    [shared_session()][async_deethon.utils.shared_session].
+    """
+    global _shared_session, _shared_session_loop
+    session, loop = _shared_session, _shared_session_loop
+    _shared_session = _shared_session_loop = None
+    if session is None or session.closed:
+        return
+    if loop.is_running() and loop is not asyncio.get_running_loop():
+        # The session belongs to an event loop of another thread
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        )
+    else:
+        await session.close()
 
 
 def md5hex(data: bytes) -> bytes:
@@ -31,26 +121,37 @@ def get_quality(bitrate: str) -> str:
     return "1"
 
 
-def get_file_path(track: Track, ext: str) -> Path:
+def get_extension(bitrate: str) -> str:
+    if bitrate == "FLAC":
+        return ".flac"
+    return ".mp3"
+
+
+def get_file_path(
+    track: Track,
+    ext: str,
+    album: Album,
+    root: Union[str, Path] = "Songs",
+) -> Path:
     """
     Generate a file path using a Track object.
 
     Args:
         track: A Track object.
         ext: The file extension to be used.
+        album: The album of the track.
+        root: The directory all the albums are stored in.
 
     Returns:
         A Path object containing the track path.
     """
-    forbidden_chars = dict((ord(char), None) for char in r'\/*?:"<>|')
-    album_artist = track.album.artist.translate(forbidden_chars)
-    album_title = track.album.title.translate(forbidden_chars)
+    album_artist = album.artist.translate(_FORBIDDEN)
+    album_title = album.title.translate(_FORBIDDEN)
 
-    std_dir = "Songs"
-    dir_path = Path(std_dir, album_artist, album_title)
+    dir_path = Path(root, album_artist, album_title)
     dir_path.mkdir(parents=True, exist_ok=True)
     file_name = f"{track.number:02} {track.title}{ext}"
-    return dir_path / file_name.translate(forbidden_chars)
+    return dir_path / file_name.translate(_FORBIDDEN)
 
 
 def get_stream_url(track: Track, quality: str) -> str:
@@ -64,19 +165,25 @@ def get_stream_url(track: Track, quality: str) -> str:
     Returns:
         The direct download url.
     """
-    data = b"\xa4".join(
-        a.encode()
-        for a in [track.md5_origin, quality, str(track.id), track.media_version]
+    inner = b"\xa4".join(
+        (
+            track.md5_origin.encode(),
+            quality.encode(),
+            str(track.id).encode(),
+            track.media_version.encode(),
+        )
     )
-    data = b"\xa4".join([md5hex(data), data]) + b"\xa4"
-    if len(data) % 16:
-        data += b"\x00" * (16 - len(data) % 16)
-    c = AES.new("jo6aey6haid2Teih".encode(), AES.MODE_ECB)
-    hashs = b2a_hex(c.encrypt(data)).decode()
+    digest = hashlib.md5(inner).hexdigest().encode()
+    # `digest + sep + inner + sep` padded with zeros to the AES block size
+    pad = _PAD[: -(len(digest) + len(inner) + 2) % 16]
+    data = b"\xa4".join((digest, inner, pad))
+    hashs = b2a_hex(_AES_CIPHER.encrypt(data)).decode()
     return f"http://e-cdn-proxy-{track.md5_origin[0]}.dzcdn.net/api/1/{hashs}"
 
 
-def tag(file_path: Path, track: Track) -> None:
+def tag(
+    file_path: Path, track: Track, album: Album, cover: Optional[bytes] = None
+) -> None:
     """
     Tag the music file at the given file path using the specified
     [Track][async_deethon.types.Track] instance.
@@ -84,6 +191,9 @@ def tag(file_path: Path, track: Track) -> None:
     Args:
         file_path (Path): The music file to be tagged
         track: The [Track][async_deethon.types.Track] instance to be used for tagging.
+        album: The [Album][async_deethon.types.Album] instance of the track.
+        cover: The album cover, e.g. from
+            [fetch_cover_xl()][async_deethon.types.Album.fetch_cover_xl].
     """
     ext = file_path.suffix
 
@@ -91,19 +201,20 @@ def tag(file_path: Path, track: Track) -> None:
         tags = ID3()
         tags.clear()
 
-        tags.add(Frames["TALB"](encoding=3, text=track.album.title))
+        tags.add(Frames["TALB"](encoding=3, text=album.title))
         tags.add(Frames["TBPM"](encoding=3, text=str(track.bpm)))
-        tags.add(Frames["TCON"](encoding=3, text=track.album.genres))
-        tags.add(Frames["TCOP"](encoding=3, text=track.copyright))
+        tags.add(Frames["TCON"](encoding=3, text=album.genres))
+        if track.copyright:
+            tags.add(Frames["TCOP"](encoding=3, text=track.copyright))
         tags.add(Frames["TDAT"](encoding=3, text=track.release_date.strftime("%d%m")))
         tags.add(Frames["TIT2"](encoding=3, text=track.title))
         tags.add(Frames["TPE1"](encoding=3, text=track.artist))
-        tags.add(Frames["TPE2"](encoding=3, text=track.album.artist))
+        tags.add(Frames["TPE2"](encoding=3, text=album.artist))
         tags.add(Frames["TPOS"](encoding=3, text=str(track.disk_number)))
-        tags.add(Frames["TPUB"](encoding=3, text=track.album.label))
+        tags.add(Frames["TPUB"](encoding=3, text=album.label))
         tags.add(
             Frames["TRCK"](
-                encoding=3, text=f"{track.number}/{track.album.total_tracks}"
+                encoding=3, text=f"{track.number}/{album.total_tracks}"
             )
         )
         tags.add(Frames["TSRC"](encoding=3, text=track.isrc))
@@ -120,28 +231,30 @@ def tag(file_path: Path, track: Track) -> None:
         if track.lyrics:
             tags.add(Frames["USLT"](encoding=3, text=track.lyrics))
 
-        tags.add(
-            Frames["APIC"](
-                encoding=3,
-                mime="image/jpeg",
-                type=3,
-                desc="Cover",
-                data=track.album.cover_xl,
+        if cover:
+            tags.add(
+                Frames["APIC"](
+                    encoding=3,
+                    mime="image/jpeg",
+                    type=3,
+                    desc="Cover",
+                    data=cover,
+                )
             )
-        )
 
         tags.save(file_path, v2_version=3)
 
     else:
         tags = FLAC(file_path)
         tags.clear()
-        tags["album"] = track.album.title
-        tags["albumartist"] = track.album.artist
+        tags["album"] = album.title
+        tags["albumartist"] = album.artist
         tags["artist"] = track.artist
         tags["bpm"] = str(track.bpm)
-        tags["copyright"] = track.copyright
+        if track.copyright:
+            tags["copyright"] = track.copyright
         tags["date"] = track.release_date.strftime("%Y-%m-%d")
-        tags["genre"] = track.album.genres
+        tags["genre"] = album.genres
         tags["isrc"] = track.isrc
         if track.lyrics:
             tags["lyrics"] = track.lyrics
@@ -150,11 +263,29 @@ def tag(file_path: Path, track: Track) -> None:
         tags["tracknumber"] = str(track.number)
         tags["year"] = str(track.release_date.year)
 
-        cover = Picture()
-        cover.type = 3
-        cover.data = track.album.cover_xl
-        cover.width = 1000
-        cover.height = 1000
         tags.clear_pictures()
-        tags.add_picture(cover)
+        if cover:
+            picture = Picture()
+            picture.type = 3
+            picture.data = cover
+            picture.width = 1000
+            picture.height = 1000
+            tags.add_picture(picture)
         tags.save(deleteid3=True)
+
+
+async def tag_async(
+    file_path: Path, track: Track, album: Album, cover: Optional[bytes] = None
+) -> None:
+    """
+    Same as [tag()][async_deethon.utils.tag], but runs the blocking
+    tagging in the default executor so the event loop is not stalled.
+
+    Args:
+        file_path (Path): The music file to be tagged
+        track: The [Track][async_deethon.types.Track] instance to be used for tagging.
+        album: The [Album][async_deethon.types.Album] instance of the track.
+        cover: The album cover.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, tag, file_path, track, album, cover)
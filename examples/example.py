@@ -4,7 +4,7 @@ import async_deethon as deethon
 
 
 async def download():
-    downloader = deethon.Session(
+    async with deethon.Session(
         "205e3b518df04fe4fccfd1cc47df"
         "811ccb5d5dc533c717e9aabab6cac"
         "25ff8f90f602078edc0586c7232897"
@@ -12,50 +12,42 @@ async def download():
         "b07ef75d904c50163a594ccaca3849eb"
         "e7bb0b4f5b783726bcf5a602e4957545d"
         "ed0d3a0b4"
-    )
-    result = await downloader.download_track_via_id(1043317462, bitrate="MP3")
+    ) as downloader:
+        result = await downloader.download_track_via_id(1043317462, bitrate="MP3")
     with open("file.mp3", "wb") as file:
         file.write(result)
 
-    await downloader.close()
-
 
 async def search():
-    downloader = deethon.Session(
+    async with deethon.Session(
         "205e3b518df04fe4fccfd1cc47df811ccb5"
         "d5dc533c717e9aabab6cac25ff8f90f60207"
         "8edc0586c7232897a30d6e65b0c83114d5be"
         "18148a4ae49b07ef75d904c50163a594ccac"
         "a3849ebe7bb0b4f5b783726bcf5a602e49575"
         "45ded0d3a0b4"
-    )
-    result = await downloader.search_songs("Cyberpunk")
+    ) as downloader:
+        result = await downloader.search_songs("Cyberpunk")
     print(result)
 
-    await downloader.close()
-
 
 async def status_bar():
     async def progress_drawer(current, total):
         print(f"\r{current / total:%}", end="")
 
-    downloader = deethon.Session(
+    async with deethon.Session(
         "205e3b518df04fe4fccfd1cc47df811ccb5"
         "d5dc533c717e9aabab6cac25ff8f90f60207"
         "8edc0586c7232897a30d6e65b0c83114d5be"
         "18148a4ae49b07ef75d904c50163a594ccac"
         "a3849ebe7bb0b4f5b783726bcf5a602e49575"
         "45ded0d3a0b4"
-    )
-    result = await downloader.download_track_via_id(
-        1043317462, bitrate="MP3",
-        progress_callback=progress_drawer,
-        callback_calls_delay=0.1
-    )
-
-    await downloader.close()
+    ) as downloader:
+        result = await downloader.download_track_via_id(
+            1043317462, bitrate="MP3",
+            progress_callback=progress_drawer,
+            callback_calls_delay=0.1
+        )
 
 
 asyncio.run(status_bar())
-
-
@@ -0,0 +1,42 @@
+TRACK_INFO = {
+    "id": 3135556,
+    "album": {"id": 302127},
+    "artist": {"name": "Daft Punk"},
+    "contributors": [{"name": "Daft Punk"}],
+    "bpm": 123.4,
+    "disk_number": 1,
+    "duration": 224,
+    "isrc": "GBDUW0000059",
+    "link": "https://www.deezer.com/track/3135556",
+    "track_position": 1,
+    "preview": "",
+    "rank": 1,
+    "gain": -12.4,
+    "release_date": "2001-03-07",
+    "title": "Harder, Better, Faster, Stronger",
+    "title_short": "Harder, Better, Faster, Stronger",
+}
+SONG_DATA = {
+    "MD5_ORIGIN": "51afcde9f56a132096c0496cc95eb24b",
+    "MEDIA_VERSION": "8",
+    "SNG_CONTRIBUTORS": [],
+}
+
+ALBUM_INFO = {
+    "id": 302127,
+    "artist": {"name": "Daft Punk"},
+    "tracks": {"data": [TRACK_INFO]},
+    "cover_small": "",
+    "cover_medium": "",
+    "cover_big": "",
+    "cover_xl": "",
+    "duration": 3660,
+    "genres": {"data": [{"name": "Electro"}]},
+    "label": "Parlophone",
+    "link": "https://www.deezer.com/album/302127",
+    "record_type": "album",
+    "release_date": "2001-03-07",
+    "title": "Discovery",
+    "nb_tracks": 1,
+    "upc": "724384960650",
+}
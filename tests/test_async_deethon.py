@@ -1,5 +1,19 @@
+import re
+from pathlib import Path
+
 from async_deethon import __version__
 
 
 def test_run():
     assert True
+
+
+def test_version_matches_pyproject():
+    pyproject = Path(__file__).parent.parent / "pyproject.toml"
+    match = re.search(
+        r'^\[tool\.poetry\]$.*?^version = "([^"]+)"$',
+        pyproject.read_text(),
+        re.MULTILINE | re.DOTALL,
+    )
+    assert match is not None
+    assert __version__ == match.group(1)
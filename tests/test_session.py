@@ -0,0 +1,372 @@
+import asyncio
+import functools
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import async_deethon as deethon
+from async_deethon import consts, session as session_module, types, utils
+
+from .samples import ALBUM_INFO, SONG_DATA, TRACK_INFO
+
+CONTENT = bytes(range(256)) * 11719 + b"end"
+
+
+def make_track() -> types.Track:
+    track = types.Track(TRACK_INFO)
+    track.set_more_tags(SONG_DATA)
+    return track
+
+
+def ranged_app(content: bytes = CONTENT) -> web.Application:
+    async def handler(request: web.Request) -> web.Response:
+        headers = {"Accept-Ranges": "bytes"}
+        if request.http_range.start is None:
+            return web.Response(body=content, headers=headers)
+        chunk = content[request.http_range]
+        start = request.http_range.start
+        headers["Content-Range"] = (
+            f"bytes {start}-{start + len(chunk) - 1}/{len(content)}"
+        )
+        return web.Response(status=206, body=chunk, headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/{quality}", handler)
+    return app
+
+
+def ignoring_ranges_app(content: bytes = CONTENT) -> web.Application:
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=content, headers={"Accept-Ranges": "bytes"})
+
+    app = web.Application()
+    app.router.add_get("/{quality}", handler)
+    return app
+
+
+async def download(app, monkeypatch, **kwargs):
+    async with TestServer(app) as server:
+        monkeypatch.setattr(
+            utils,
+            "get_stream_url",
+            lambda track, quality: str(server.make_url(f"/{quality}")),
+        )
+        async with deethon.Session("arl") as session:
+            return await session.download_track(make_track(), **kwargs)
+
+
+@pytest.mark.parametrize("parts", [1, 2, 7])
+def test_download_ranges_in_memory(monkeypatch, parts):
+    result = asyncio.run(download(ranged_app(), monkeypatch, parts=parts))
+    assert result == CONTENT
+
+
+@pytest.mark.parametrize("parts", [1, 2, 7])
+def test_download_ranges_to_file(monkeypatch, tmp_path, parts):
+    dest = tmp_path / "track.flac"
+    result = asyncio.run(
+        download(ranged_app(), monkeypatch, parts=parts, dest=dest)
+    )
+    assert result == dest
+    assert dest.read_bytes() == CONTENT
+
+
+def test_download_ranges_ignored_in_memory(monkeypatch):
+    result = asyncio.run(download(ignoring_ranges_app(), monkeypatch, parts=4))
+    assert result == CONTENT
+
+
+def test_download_ranges_ignored_to_file(monkeypatch, tmp_path):
+    dest = tmp_path / "track.flac"
+    asyncio.run(download(ignoring_ranges_app(), monkeypatch, parts=4, dest=dest))
+    assert dest.read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize(
+    "total, parts, expected",
+    [
+        (10, 1, [(0, 9)]),
+        (10, 3, [(0, 3), (4, 7), (8, 9)]),
+        (10, 5, [(0, 1), (2, 3), (4, 5), (6, 7), (8, 9)]),
+        (3, 8, [(0, 0), (1, 1), (2, 2)]),
+    ],
+)
+def test_split_ranges(total, parts, expected):
+    assert session_module._split_ranges(total, parts) == expected
+
+
+def test_buffer_writer_fills_its_range():
+    buffer = bytearray(10)
+    write = session_module._buffer_writer(buffer, 4, 7)
+    write(b"ab")
+    write(b"cd")
+    assert buffer == b"\x00" * 4 + b"abcd" + b"\x00" * 2
+
+
+def test_buffer_writer_refuses_to_write_past_the_range():
+    buffer = bytearray(10)
+    write = session_module._buffer_writer(buffer, 4, 7)
+    write(b"abc")
+    with pytest.raises(session_module._RangeNotSatisfiedError):
+        write(b"de")
+    assert buffer == b"\x00" * 4 + b"abc" + b"\x00" * 3
+
+
+def test_download_ranges_returns_bytearray(monkeypatch):
+    result = asyncio.run(download(ranged_app(), monkeypatch, parts=2))
+    assert isinstance(result, bytearray)
+
+
+def progress_calls(callback, chunks, total, calls_delay):
+    async def run():
+        progress = session_module._Progress(total, callback, calls_delay)
+        for chunk in chunks:
+            await progress.advance(chunk)
+
+    asyncio.run(run())
+
+
+def test_progress_throttles_calls_but_reports_completion():
+    calls = []
+    progress_calls(lambda *args: calls.append(args), [2] * 5, 10, 60)
+    assert calls == [(10, 10)]
+
+
+def test_progress_awaits_coroutine_callbacks():
+    calls = []
+
+    async def callback(current, total):
+        calls.append((current, total))
+
+    progress_calls(callback, [2] * 5, 10, -1)
+    assert calls == [(2, 10), (4, 10), (6, 10), (8, 10), (10, 10)]
+
+
+def flac_unavailable_app(content: bytes = CONTENT) -> web.Application:
+    quality_bodies = {utils.get_quality("FLAC"): b""}
+
+    async def handler(request: web.Request) -> web.Response:
+        quality = request.match_info["quality"]
+        return web.Response(body=quality_bodies.get(quality, content))
+
+    app = web.Application()
+    app.router.add_get("/{quality}", handler)
+    return app
+
+
+def test_download_track_dest_factory_gets_fallback_bitrate(monkeypatch, tmp_path):
+    bitrates = []
+
+    def dest(bitrate):
+        bitrates.append(bitrate)
+        return tmp_path / f"track{utils.get_extension(bitrate)}"
+
+    result = asyncio.run(
+        download(flac_unavailable_app(), monkeypatch, bitrate="FLAC", dest=dest)
+    )
+    assert bitrates == ["MP3_320"]
+    assert result == tmp_path / "track.mp3"
+    assert result.read_bytes() == CONTENT
+
+
+def test_download_album_names_files_after_fallback_bitrate(monkeypatch, tmp_path):
+    album = types.Album(ALBUM_INFO)
+    for track in album.fetch_tracks():
+        track.set_more_tags(SONG_DATA)
+
+    async def get_songs_bulk(self, ids):
+        return {"data": []}
+
+    monkeypatch.setattr(deethon.Session, "get_songs_bulk", get_songs_bulk)
+
+    async def run():
+        async with TestServer(flac_unavailable_app()) as server:
+            monkeypatch.setattr(
+                utils,
+                "get_stream_url",
+                lambda track, quality: str(server.make_url(f"/{quality}")),
+            )
+            async with deethon.Session("arl") as session:
+                return await session.download_album(album, "FLAC", dest=tmp_path)
+
+    (path,) = asyncio.run(run())
+    assert path == tmp_path / "Daft Punk" / "Discovery" / (
+        "01 Harder, Better, Faster, Stronger.mp3"
+    )
+    assert path.read_bytes() == CONTENT
+
+
+def iter_completed(tracks, download):
+    return session_module.Session._iter_completed(tracks, download)
+
+
+def test_iter_completed_yields_in_completion_order():
+    async def download(track):
+        await asyncio.sleep(track / 100)
+        return track * 10
+
+    async def run():
+        return [pair async for pair in iter_completed([3, 1, 2], download)]
+
+    assert asyncio.run(run()) == [(1, 10), (2, 20), (3, 30)]
+
+
+def test_iter_completed_starts_nothing_until_iterated():
+    started = []
+
+    async def download(track):
+        started.append(track)
+
+    async def run():
+        iter_completed([1, 2], download)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert started == []
+
+
+def test_iter_completed_cancels_unfinished_downloads_on_close():
+    cancelled = []
+
+    async def download(track):
+        try:
+            await asyncio.sleep(track)
+        except asyncio.CancelledError:
+            cancelled.append(track)
+            raise
+        return track
+
+    async def run():
+        downloads = iter_completed([0, 10, 20], download)
+        async for track, _ in downloads:
+            break
+        await downloads.aclose()
+        return track
+
+    assert asyncio.run(run()) == 0
+    assert sorted(cancelled) == [10, 20]
+
+
+def test_iter_completed_cancels_unfinished_downloads_on_error():
+    cancelled = []
+
+    async def download(track):
+        if track == 0:
+            raise deethon.errors.DownloadError(track)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(track)
+            raise
+
+    async def run():
+        async for _ in iter_completed([0, 1, 2], download):
+            pass
+
+    with pytest.raises(deethon.errors.DownloadError):
+        asyncio.run(run())
+    assert sorted(cancelled) == [1, 2]
+
+
+def test_progress_awaits_partial_and_callable_object_callbacks():
+    calls = []
+
+    async def callback(label, current, total):
+        calls.append((label, current, total))
+
+    class Callback:
+        async def __call__(self, current, total):
+            calls.append(("object", current, total))
+
+    progress_calls(functools.partial(callback, "partial"), [5, 5], 10, -1)
+    progress_calls(Callback(), [10], 10, -1)
+    assert calls == [("partial", 5, 10), ("partial", 10, 10), ("object", 10, 10)]
+
+
+def test_download_album_hydrates_tracks_with_one_bulk_request(monkeypatch):
+    track_info = dict(TRACK_INFO, id=3135557)
+    album = types.Album(
+        dict(ALBUM_INFO, id=302128, tracks={"data": [track_info]})
+    )
+    (track,) = album.fetch_tracks()
+    assert track.md5_origin is None
+    api_calls = []
+
+    async def get_api(self, method, json=None):
+        api_calls.append((method, json))
+        assert method == consts.METHOD_GET_TRACK_LIST
+        return {
+            "data": [
+                {
+                    "SNG_ID": str(track.id),
+                    "MD5_ORIGIN": "0123456789abcdef0123456789abcdef",
+                    "MEDIA_VERSION": "4",
+                    "SNG_CONTRIBUTORS": {"composer": ["Thomas Bangalter"]},
+                    "COPYRIGHT": "(P) 2001 Daft Life",
+                }
+            ]
+        }
+
+    async def add_more_tags(self, session):
+        raise AssertionError("deezer.pageTrack must not be requested")
+
+    monkeypatch.setattr(deethon.Session, "get_api", get_api)
+    monkeypatch.setattr(types.Track, "add_more_tags", add_more_tags)
+
+    async def run():
+        async with TestServer(ranged_app()) as server:
+            monkeypatch.setattr(
+                utils,
+                "get_stream_url",
+                lambda track, quality: str(server.make_url(f"/{quality}")),
+            )
+            async with deethon.Session("arl") as session:
+                return await session.download_album(album, "FLAC")
+
+    assert asyncio.run(run()) == [CONTENT]
+    assert api_calls == [(consts.METHOD_GET_TRACK_LIST, {"sng_ids": [track.id]})]
+    assert track.md5_origin == "0123456789abcdef0123456789abcdef"
+    assert track.media_version == "4"
+    assert track.composer == ["Thomas Bangalter"]
+    assert track.copyright == "(P) 2001 Daft Life"
+
+
+@pytest.mark.parametrize("max_parallel_tracks", [1, 2, 3])
+def test_download_album_bounds_parallel_downloads(monkeypatch, max_parallel_tracks):
+    tracks_info = [dict(TRACK_INFO, id=track_id) for track_id in range(10, 16)]
+    album = types.Album(dict(ALBUM_INFO, id=302129, tracks={"data": tracks_info}))
+    for track in album.fetch_tracks():
+        track.set_more_tags(SONG_DATA)
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal in_flight, peak
+        if request.method == "HEAD":
+            return web.Response(body=CONTENT)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return web.Response(body=CONTENT)
+
+    async def get_songs_bulk(self, ids):
+        return {"data": []}
+
+    monkeypatch.setattr(deethon.Session, "get_songs_bulk", get_songs_bulk)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{quality}", handler)
+        async with TestServer(app) as server:
+            monkeypatch.setattr(
+                utils,
+                "get_stream_url",
+                lambda track, quality: str(server.make_url(f"/{quality}")),
+            )
+            async with deethon.Session("arl", max_parallel_tracks) as session:
+                return await session.download_album(album, "FLAC")
+
+    assert asyncio.run(run()) == [CONTENT] * len(tracks_info)
+    assert peak == max_parallel_tracks
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from async_deethon import types, utils
+
+from .samples import ALBUM_INFO, SONG_DATA, TRACK_INFO
+
+
+@pytest.mark.parametrize(
+    "date, expected",
+    [
+        ("2001-03-07", datetime(2001, 3, 7)),
+        ("1999-12-31", datetime(1999, 12, 31)),
+        ("2020-2-9", datetime(2020, 2, 9)),
+    ],
+)
+def test_parse_date(date, expected):
+    assert types._parse_date(date) == expected
+
+
+@pytest.mark.parametrize("date", ["0000-00-00", "2001-02-30", "unknown"])
+def test_parse_date_rejects_invalid_dates(date):
+    with pytest.raises(ValueError):
+        types._parse_date(date)
+
+
+def test_track_extra_tags_default_to_none():
+    track = types.Track(dict(TRACK_INFO, id=1))
+    assert track.md5_origin is None
+    assert track.lyrics is None
+
+
+def test_track_extra_tags_can_be_set():
+    track = types.Track(dict(TRACK_INFO, id=2))
+    track.set_more_tags(SONG_DATA)
+    track.lyrics = "Work it harder"
+    assert track.md5_origin == SONG_DATA["MD5_ORIGIN"]
+    assert track.lyrics == "Work it harder"
+
+
+def test_track_unknown_attribute():
+    track = types.Track(dict(TRACK_INFO, id=3))
+    with pytest.raises(AttributeError):
+        track.unknown
+    with pytest.raises(AttributeError):
+        track.unknown = 1
+
+
+def test_get_file_path(tmp_path):
+    album = types.Album(dict(ALBUM_INFO, id=1, title="Discovery: Live?"))
+    (track,) = album.fetch_tracks()
+    path = utils.get_file_path(track, ".flac", album, root=tmp_path)
+    assert path == tmp_path / "Daft Punk" / "Discovery Live" / (
+        "01 Harder, Better, Faster, Stronger.flac"
+    )
+    assert path.parent.is_dir()
@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3
+
+from async_deethon import types, utils
+
+from .samples import ALBUM_INFO, SONG_DATA
+
+
+@pytest.mark.parametrize(
+    "md5_origin, quality, track_id, media_version, expected",
+    [
+        (
+            "51afcde9f56a132096c0496cc95eb24b",
+            "9",
+            3135556,
+            "8",
+            "http://e-cdn-proxy-5.dzcdn.net/api/1/b4bdabb755afe7996f48e7593319d0d5"
+            "5deb3fe40ddace87eb4cdd6fb573c07a2f5a0bea21e1d6dbd9c8f34c691e12dc83ca"
+            "c650c014d41f69d381b0ce749ff5e8afa909245bdf9d34143868590724c3",
+        ),
+        (
+            "51afcde9f56a132096c0496cc95eb24b",
+            "1",
+            3135556,
+            "8",
+            "http://e-cdn-proxy-5.dzcdn.net/api/1/e0b17ae5690e6db5353cc8b378d775f9"
+            "a4d46c73b165812ae126df12d67a57762f5a0bea21e1d6dbd9c8f34c691e12dc83ca"
+            "c650c014d41f69d381b0ce749ff57029877831a7426e7ce87d562fd2c22a",
+        ),
+        (
+            "a1",
+            "3",
+            7,
+            "12",
+            "http://e-cdn-proxy-a.dzcdn.net/api/1/b6a14960283c420df4e1730055c66ee2"
+            "a50882faccd8a19d27f0a0a4d9a7f0d3701608c5b2a9ac65f3b8804edf948d24",
+        ),
+        # The payload is already aligned to the AES block size
+        (
+            "abcdefgh",
+            "9",
+            7,
+            "1",
+            "http://e-cdn-proxy-a.dzcdn.net/api/1/5a9e1a00f56119183701a934f94d838c"
+            "2d16a017cdc9a682b0a3f5848605a2572a46732c62e3d4c55feb10b728cd7f3c",
+        ),
+    ],
+)
+def test_get_stream_url(md5_origin, quality, track_id, media_version, expected):
+    track = SimpleNamespace(
+        md5_origin=md5_origin, id=track_id, media_version=media_version
+    )
+    assert utils.get_stream_url(track, quality) == expected
+
+
+def minimal_flac() -> bytes:
+    """A FLAC stream with only the STREAMINFO block: 44.1 kHz, stereo, 16 bit."""
+    packed = (44100 << 44) | (1 << 41) | (15 << 36)
+    stream_info = (
+        (4096).to_bytes(2, "big") * 2
+        + bytes(6)
+        + packed.to_bytes(8, "big")
+        + bytes(16)
+    )
+    return b"fLaC" + b"\x80" + len(stream_info).to_bytes(3, "big") + stream_info
+
+
+def tag_file(path, cover):
+    album = types.Album(ALBUM_INFO)
+    (track,) = album.fetch_tracks()
+    track.set_more_tags(dict(SONG_DATA, COPYRIGHT="(P) 2001 Daft Life"))
+    track.lyrics = "Work it harder"
+    asyncio.run(utils.tag_async(path, track, album, cover))
+
+
+def test_tag_async_mp3(tmp_path):
+    path = tmp_path / "track.mp3"
+    path.write_bytes(b"")
+    tag_file(path, b"cover")
+
+    tags = ID3(path)
+    assert tags["TALB"].text == ["Discovery"]
+    assert tags["TIT2"].text == ["Harder, Better, Faster, Stronger"]
+    assert tags["TPE2"].text == ["Daft Punk"]
+    assert tags["TCON"].text == ["Electro"]
+    assert tags["TCOP"].text == ["(P) 2001 Daft Life"]
+    assert tags["TRCK"].text == ["1/1"]
+    assert tags.getall("USLT")[0].text == "Work it harder"
+    assert tags.getall("APIC")[0].data == b"cover"
+
+
+def test_tag_async_flac(tmp_path):
+    path = tmp_path / "track.flac"
+    path.write_bytes(minimal_flac())
+    tag_file(path, b"cover")
+
+    tags = FLAC(path)
+    assert tags["album"] == ["Discovery"]
+    assert tags["albumartist"] == ["Daft Punk"]
+    assert tags["genre"] == ["Electro"]
+    assert tags["date"] == ["2001-03-07"]
+    assert tags["lyrics"] == ["Work it harder"]
+    assert [picture.data for picture in tags.pictures] == [b"cover"]
+
+
+def test_tag_async_flac_without_cover(tmp_path):
+    path = tmp_path / "track.flac"
+    path.write_bytes(minimal_flac())
+    tag_file(path, None)
+
+    assert FLAC(path).pictures == []
+
+
+def test_shared_session_is_reused_within_a_loop():
+    async def run():
+        first = await utils.shared_session()
+        second = await utils.shared_session()
+        await utils.close_shared_session()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.closed
+
+
+def test_shared_session_of_a_previous_loop_is_closed():
+    previous = asyncio.run(utils.shared_session())
+
+    async def run():
+        current = await utils.shared_session()
+        await utils.close_shared_session()
+        return current
+
+    current = asyncio.run(run())
+    assert current is not previous
+    assert previous.closed
+    assert current.closed
+
+
+def test_close_shared_session_without_session():
+    asyncio.run(utils.close_shared_session())
+
+
+def test_ssl_context_is_created_once():
+    assert utils._ssl_context() is utils._ssl_context()